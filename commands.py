@@ -1,4 +1,5 @@
 import argparse
+import functools
 from todo import ToDoManager
 from utils import print_tasks, print_error, ensure_positive_int
 
@@ -54,47 +55,80 @@ def cmd_reorder(manager: ToDoManager, args: argparse.Namespace) -> None:
     cmd_list(manager, argparse.Namespace(pending=False))
 
 
+# ---- Dispatch ----
+
+COMMANDS = {
+    "add": cmd_add,
+    "list": cmd_list,
+    "done": cmd_done,
+    "undone": cmd_undone,
+    "delete": cmd_delete,
+    "clear": cmd_clear,
+    "search": cmd_search,
+    "rename": cmd_rename,
+    "stats": cmd_stats,
+    "reorder": cmd_reorder,
+}
+
+
+def dispatch(args: argparse.Namespace) -> None:
+    """Run the handler named by args.cmd — a single dict lookup."""
+    COMMANDS[args.cmd](args.manager, args)
+
+
 # ---- Wiring to argparse ----
 
 def register_subcommands(parser: argparse.ArgumentParser, manager: ToDoManager) -> None:
+    _register_structure(parser)
+    parser.set_defaults(manager=manager)
+
+
+@functools.lru_cache(maxsize=None)
+def _register_structure(parser: argparse.ArgumentParser) -> None:
+    """Attach the subcommand structure once per parser.
+
+    The structure is manager-independent; register_subcommands binds the
+    current manager afterwards via set_defaults, so re-registering the same
+    parser (e.g. across repeated main() calls) is a cached no-op.
+    """
     sub = parser.add_subparsers(dest="command", required=True)
 
     sp = sub.add_parser("add", help="Add a new task")
     sp.add_argument("title", type=str)
-    sp.set_defaults(run=lambda a: cmd_add(manager, a))
+    sp.set_defaults(cmd="add")
 
     sp = sub.add_parser("list", help="List tasks")
     sp.add_argument("--pending", action="store_true", help="Show only pending tasks")
-    sp.set_defaults(run=lambda a: cmd_list(manager, a))
+    sp.set_defaults(cmd="list")
 
     sp = sub.add_parser("done", help="Mark a task as done")
     sp.add_argument("id", type=int)
-    sp.set_defaults(run=lambda a: cmd_done(manager, a))
+    sp.set_defaults(cmd="done")
 
     sp = sub.add_parser("undone", help="Mark a task as not done")
     sp.add_argument("id", type=int)
-    sp.set_defaults(run=lambda a: cmd_undone(manager, a))
+    sp.set_defaults(cmd="undone")
 
     sp = sub.add_parser("delete", help="Delete a task")
     sp.add_argument("id", type=int)
-    sp.set_defaults(run=lambda a: cmd_delete(manager, a))
+    sp.set_defaults(cmd="delete")
 
     sp = sub.add_parser("clear", help="Delete all completed tasks")
-    sp.set_defaults(run=lambda a: cmd_clear(manager, a))
+    sp.set_defaults(cmd="clear")
 
     sp = sub.add_parser("search", help="Search in task titles")
     sp.add_argument("query", type=str)
     sp.add_argument("--all", action="store_true", help="Search across all tasks (not only pending)")
-    sp.set_defaults(run=lambda a: cmd_search(manager, a))
+    sp.set_defaults(cmd="search")
 
     sp = sub.add_parser("rename", help="Rename a task")
     sp.add_argument("id", type=int)
     sp.add_argument("title", type=str)
-    sp.set_defaults(run=lambda a: cmd_rename(manager, a))
+    sp.set_defaults(cmd="rename")
 
     sp = sub.add_parser("stats", help="Show stats")
-    sp.set_defaults(run=lambda a: cmd_stats(manager, a))
+    sp.set_defaults(cmd="stats")
 
     sp = sub.add_parser("reorder", help="Reorder by comma-separated ids, e.g. 3,1,2")
     sp.add_argument("ids", type=str)
-    sp.set_defaults(run=lambda a: cmd_reorder(manager, a))
+    sp.set_defaults(cmd="reorder")
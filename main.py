@@ -1,4 +1,6 @@
 import argparse
+import functools
+import shlex
 from pathlib import Path
 from todo import ToDoManager
 from colorama import Fore, Style
@@ -18,8 +20,7 @@ def cmd_list(args):
     if not items:
         print(Fore.BLUE + Style.BRIGHT + f"No tasks." + Style.RESET_ALL)
         return
-    for t in items:
-        print(repr(t))
+    print("\n".join(repr(t) for t in items))
 
 def cmd_done(args):
     t = manager.complete_task(args.id, done=True)
@@ -42,8 +43,7 @@ def cmd_search(args):
     if not items:
         print("No matches.")
         return
-    for t in items:
-        print(repr(t))
+    print("\n".join(repr(t) for t in items))
 
 def cmd_rename(args):
     t = manager.rename_task(args.id, args.title)
@@ -62,6 +62,37 @@ def cmd_reorder(args):
     print("Order updated.")
     cmd_list(argparse.Namespace(pending=False))
 
+def cmd_repl(args):
+    """Run many commands in one process; load and save happen only once."""
+    try:
+        import readline  # noqa: F401 -- line editing/history for input()
+    except ImportError:
+        pass
+    parser = build_parser()
+    while True:
+        try:
+            line = input("todo> ")
+        except EOFError:
+            break
+        line = line.strip()
+        if not line or line in ("quit", "exit"):
+            if not line:
+                continue
+            break
+        try:
+            sub = parser.parse_args(shlex.split(line))
+        except SystemExit:
+            # argparse already printed the error/usage; stay in the loop
+            continue
+        if sub.func is cmd_repl:
+            continue
+        try:
+            sub.func(sub)
+        except (KeyError, ValueError) as e:
+            print(Fore.RED + Style.BRIGHT + f"Error: {e}" + Style.RESET_ALL)
+
+
+@functools.lru_cache(maxsize=1)
 def build_parser():
     p = argparse.ArgumentParser(prog="todo", description="JSON-persistent ToDo CLI")
     p.add_argument(
@@ -70,6 +101,11 @@ def build_parser():
         default=DEFAULT_DATA_PATH,
         help=f"Path to JSON data file (default: {DEFAULT_DATA_PATH})",
     )
+    p.add_argument(
+        "--pretty",
+        action="store_true",
+        help="Write the data file indented instead of minified",
+    )
     sub = p.add_subparsers(dest="command", required=True)
 
     sp = sub.add_parser("add", help="Add a new task")
@@ -112,6 +148,9 @@ def build_parser():
     sp.add_argument("ids", type=str)
     sp.set_defaults(func=cmd_reorder)
 
+    sp = sub.add_parser("repl", help="Interactive mode: run many commands, load/save once")
+    sp.set_defaults(func=cmd_repl)
+
     return p
 
 def main():
@@ -120,7 +159,11 @@ def main():
 
     # 1) LOAD
     data_path: Path = args.data_path
-    manager.load_from_file(data_path)
+    try:
+        manager.load_from_file(data_path)
+    except RuntimeError as e:
+        print(Fore.RED + Style.BRIGHT + f"Error: {e}" + Style.RESET_ALL)
+        return
 
     try:
         # 2) RUN COMMAND
@@ -130,7 +173,7 @@ def main():
     finally:
         # 3) SAVE (after every run; safe and simple)
         try:
-            manager.save_to_file(data_path)
+            manager.save_to_file(data_path, pretty=args.pretty)
         except Exception as e:
             print(f"Warning: could not save data: {e}")
 
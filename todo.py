@@ -1,55 +1,123 @@
 from __future__ import annotations
+import os
+import sys
 from dataclasses import dataclass, field
+from itertools import compress
 from typing import List, Optional, Iterable, Dict, Any
 from datetime import datetime
 from colorama import init, Fore, Style
 init(autoreset=True)
 
+try:
+    import orjson
+except ImportError:
+    import json
+    orjson = None
 
-@dataclass
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# Suffixes that select the binary msgpack store instead of JSON.
+_MSGPACK_SUFFIXES = frozenset({".msgpack", ".mpk"})
+
+# Suffixes that select the append-only NDJSON event journal: each mutation
+# appends one event line, so saves don't rewrite the whole file.
+_JOURNAL_SUFFIXES = frozenset({".ndjson", ".jsonl"})
+
+# Compact the journal once it holds this many lines per live task.
+_JOURNAL_COMPACT_RATIO = 10
+
+
+def _msgpack_default(obj: Any) -> str:
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    raise TypeError(f"Cannot serialize {type(obj).__name__}")
+
+
+def _intern(s: str) -> str:
+    """Intern short strings so duplicated titles share one object."""
+    return sys.intern(s) if len(s) <= 64 else s
+
+
+@dataclass(slots=True)
 class Task:
     id: int
     title: str
     done: bool = False
     created_at: datetime = field(default_factory=datetime.now)
+    # Formatted once here; created_at never changes after construction,
+    # so __repr__ can skip the strftime on every list print.
+    _ts_str: str = field(init=False, repr=False, compare=False)
+    # Both repr variants, prebuilt so __repr__ is just an attribute pick.
+    # Only a title change needs a rebuild (see _rebuild_repr).
+    _repr_done: str = field(init=False, repr=False, compare=False)
+    _repr_pending: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self._ts_str = self.created_at.strftime("%Y-%m-%d %H:%M")
+        self._rebuild_repr()
+
+    def _rebuild_repr(self) -> None:
+        tail = f"#{self.id} {self.title}  ({self._ts_str}){Style.RESET_ALL}"
+        self._repr_done = f"{Fore.LIGHTGREEN_EX}{Style.BRIGHT}[-] {tail}"
+        self._repr_pending = f"{Fore.YELLOW}{Style.BRIGHT}[•] {tail}"
 
     def __repr__(self) -> str:
-        status = "-" if self.done else "•"
-        ts = self.created_at.strftime("%Y-%m-%d %H:%M")
-        if self.done:
-         color = Fore.LIGHTGREEN_EX + Style.BRIGHT
-        else:
-         color = Fore.YELLOW + Style.BRIGHT
-        return f"{color}[{status}] #{self.id} {self.title}  ({ts}){Style.RESET_ALL}"
+        return self._repr_done if self.done else self._repr_pending
 
     # ---helpers ---
     def to_dict(self) -> Dict[str, Any]:
+        # orjson serializes datetime natively; stdlib json needs a string.
+        if orjson is not None:
+            created = self.created_at
+        else:
+            created = self.created_at.isoformat(timespec="seconds")
         return {
             "id": self.id,
             "title": self.title,
             "done": self.done,
-            "created_at": self.created_at.isoformat(timespec="seconds"),
+            "created_at": created,
         }
 
     @staticmethod
     def from_dict(d: Dict[str, Any]) -> "Task":
+        # No per-field coercion or try/except here: the JSON decoder already
+        # yields the right types, and load_from_file treats any bad record as
+        # a corrupt file.
         created = d.get("created_at")
-        try:
-            dt = datetime.fromisoformat(created) if created else datetime.now()
-        except Exception:
-            dt = datetime.now()
         return Task(
-            id=int(d["id"]),
-            title=str(d["title"]),
-            done=bool(d.get("done", False)),
-            created_at=dt,
+            id=d["id"],
+            title=_intern(d["title"]),
+            done=d.get("done", False),
+            created_at=datetime.fromisoformat(created) if created else datetime.now(),
         )
 
 
 class ToDoManager:
     def __init__(self) -> None:
         self._tasks: List[Task] = []
+        self._by_id: Dict[int, Task] = {}
+        # Hot columns kept parallel to self._tasks, so scans that only
+        # need one field (search, stats, pending filters) never touch
+        # the Task objects themselves.
+        # casefold() makes the substring test locale-independent (e.g. ß ≈ ss).
+        self._title_cf: List[str] = []
+        self._done: bytearray = bytearray()
+        # Search indexes, built lazily on first search and thrown away on
+        # any mutation (positions shift too easily to patch in place).
+        self._pending_idx: Optional[List[int]] = None
+        self._char_idx: Optional[Dict[str, List[int]]] = None
         self._next_id: int = 1
+        self._dirty: bool = False
+        self._dir_ready: bool = False
+        # Mutation events since the last load/save, for the journal store.
+        self._events: List[Dict[str, Any]] = []
+        self._journal_lines: int = 0
+        # When True the next journal save must rewrite the file instead of
+        # appending (set when replay found the log damaged).
+        self._journal_rewrite: bool = False
 
     # ---------- Create ----------
     def add_task(self, title: str) -> Task:
@@ -58,32 +126,70 @@ class ToDoManager:
             raise ValueError("Title cannot be empty.")
         task = Task(id=self._next_id, title=title)
         self._tasks.append(task)
+        self._by_id[task.id] = task
+        self._title_cf.append(task.title.casefold())
+        self._done.append(0)
         self._next_id += 1
+        self._events.append({"op": "add", "id": task.id, "title": task.title,
+                             "created_at": task.created_at.isoformat()})
+        self._invalidate_search_index()
+        self._dirty = True
         return task
 
     # ---------- Read ----------
     def list_tasks(self, show_done: bool = True) -> List[Task]:
         if show_done:
             return list(self._tasks)
-        return [t for t in self._tasks if not t.done]
+        return list(compress(self._tasks, (not d for d in self._done)))
 
     def get(self, task_id: int) -> Task:
-        task = next((t for t in self._tasks if t.id == task_id), None)
+        task = self._by_id.get(task_id)
         if task is None:
             raise KeyError(f"No task with id {task_id}.")
         return task
 
     def search(self, query: str, show_done: Optional[bool] = None) -> List[Task]:
-        q = query.strip().lower()
-        items = self._tasks
-        if show_done is not None:
-            items = [t for t in items if t.done == show_done]
-        return [t for t in items if q in t.title.lower()]
+        q = query.strip().casefold()
+        if self._char_idx is None:
+            self._build_search_index()
+        if not q:
+            if show_done is None:
+                return list(self._tasks)
+            if show_done:
+                return list(compress(self._tasks, self._done))
+            return [self._tasks[i] for i in self._pending_idx]
+        # Narrow to titles containing the query's first character before
+        # running the substring test on each candidate.
+        candidates = self._char_idx.get(q[0], ())
+        tasks, cf, done = self._tasks, self._title_cf, self._done
+        if show_done is None:
+            return [tasks[i] for i in candidates if q in cf[i]]
+        want = 1 if show_done else 0
+        return [tasks[i] for i in candidates if done[i] == want and q in cf[i]]
+
+    def _build_search_index(self) -> None:
+        pending: List[int] = []
+        buckets: Dict[str, List[int]] = {}
+        for i, (cf, d) in enumerate(zip(self._title_cf, self._done)):
+            if not d:
+                pending.append(i)
+            for ch in set(cf):
+                buckets.setdefault(ch, []).append(i)
+        self._pending_idx = pending
+        self._char_idx = buckets
+
+    def _invalidate_search_index(self) -> None:
+        self._pending_idx = None
+        self._char_idx = None
 
     # ---------- Update ----------
     def complete_task(self, task_id: int, done: bool = True) -> Task:
         task = self.get(task_id)
         task.done = done
+        self._done[self._tasks.index(task)] = 1 if done else 0
+        self._events.append({"op": "done", "id": task_id, "done": done})
+        self._invalidate_search_index()
+        self._dirty = True
         return task
 
     def rename_task(self, task_id: int, new_title: str) -> Task:
@@ -92,36 +198,62 @@ class ToDoManager:
             raise ValueError("New title cannot be empty.")
         task = self.get(task_id)
         task.title = new_title
+        task._rebuild_repr()
+        self._title_cf[self._tasks.index(task)] = new_title.casefold()
+        self._events.append({"op": "rename", "id": task_id, "title": new_title})
+        self._invalidate_search_index()
+        self._dirty = True
         return task
 
     def reorder(self, ids_in_order: Iterable[int]) -> None:
-        id_to_task = {t.id: t for t in self._tasks}
         new_order: List[Task] = []
         seen = set()
         for i in ids_in_order:
-            if i in id_to_task and i not in seen:
-                new_order.append(id_to_task[i])
+            if i in self._by_id and i not in seen:
+                new_order.append(self._by_id[i])
                 seen.add(i)
         for t in self._tasks:
             if t.id not in seen:
                 new_order.append(t)
         self._tasks = new_order
+        self._title_cf = [t.title.casefold() for t in new_order]
+        self._done = bytearray(1 if t.done else 0 for t in new_order)
+        self._events.append({"op": "reorder", "ids": [t.id for t in new_order]})
+        self._invalidate_search_index()
+        self._dirty = True
 
     # ---------- Delete ----------
     def delete_task(self, task_id: int) -> Task:
         task = self.get(task_id)
-        self._tasks = [t for t in self._tasks if t.id != task_id]
+        i = self._tasks.index(task)
+        del self._tasks[i]
+        del self._title_cf[i]
+        del self._done[i]
+        del self._by_id[task_id]
+        self._events.append({"op": "delete", "id": task_id})
+        self._invalidate_search_index()
+        self._dirty = True
         return task
 
     def clear_completed(self) -> int:
-        before = len(self._tasks)
-        self._tasks = [t for t in self._tasks if not t.done]
-        return before - len(self._tasks)
+        removed = sum(self._done)
+        if not removed:
+            return 0
+        keep = [not d for d in self._done]
+        # Slice-assign to filter in place and keep the list objects alive.
+        self._title_cf[:] = compress(self._title_cf, keep)
+        self._tasks[:] = compress(self._tasks, keep)
+        self._done[:] = bytes(len(self._tasks))  # survivors are all pending
+        self._by_id = {t.id: t for t in self._tasks}
+        self._events.append({"op": "clear"})
+        self._invalidate_search_index()
+        self._dirty = True
+        return removed
 
     # ---------- Stats ----------
     def stats(self) -> dict:
         total = len(self._tasks)
-        done = sum(1 for t in self._tasks if t.done)
+        done = sum(self._done)  # C-level loop over the bytearray
         return {"total": total, "done": done, "pending": total - done}
 
     # ---------- Persistence ----------
@@ -135,30 +267,205 @@ class ToDoManager:
         self._next_id = int(store.get("next_id", 1))
         raw_tasks = store.get("tasks", [])
         self._tasks = [Task.from_dict(rt) for rt in raw_tasks]
+        self._by_id = {t.id: t for t in self._tasks}
+        self._title_cf = [_intern(t.title.casefold()) for t in self._tasks]
+        self._done = bytearray(1 if t.done else 0 for t in self._tasks)
+        self._invalidate_search_index()
+
+    def _replay_journal(self, path: "Path") -> None:
+        """Rebuild state by streaming the NDJSON event log line by line."""
+        loads = orjson.loads if orjson is not None else json.loads
+        tasks: List[Task] = []
+        by_id: Dict[int, Task] = {}
+        next_id = 1
+        lines = 0
+        with path.open("rb") as fh:
+            for line in fh:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    ev = loads(line)
+                except Exception:
+                    # A truncated final line is what a crash mid-append leaves
+                    # behind: keep everything replayed so far and schedule a
+                    # rewrite. A bad line followed by more data is real
+                    # corruption and still fails the whole load.
+                    if fh.read().strip():
+                        raise
+                    self._journal_rewrite = True
+                    break
+                lines += 1
+                op = ev["op"]
+                if op == "meta":
+                    next_id = max(next_id, ev["next_id"])
+                elif op == "add":
+                    t = Task(
+                        id=ev["id"],
+                        title=_intern(ev["title"]),
+                        done=ev.get("done", False),
+                        created_at=datetime.fromisoformat(ev["created_at"]),
+                    )
+                    tasks.append(t)
+                    by_id[t.id] = t
+                    if t.id >= next_id:
+                        next_id = t.id + 1
+                elif op == "done":
+                    by_id[ev["id"]].done = ev["done"]
+                elif op == "rename":
+                    t = by_id[ev["id"]]
+                    t.title = _intern(ev["title"])
+                    t._rebuild_repr()
+                elif op == "delete":
+                    tasks.remove(by_id.pop(ev["id"]))
+                elif op == "clear":
+                    tasks = [t for t in tasks if not t.done]
+                    by_id = {t.id: t for t in tasks}
+                elif op == "reorder":
+                    tasks = [by_id[i] for i in ev["ids"]]
+                else:
+                    raise ValueError(f"Unknown journal op: {op}")
+        self._tasks = tasks
+        self._by_id = by_id
+        self._title_cf = [_intern(t.title.casefold()) for t in tasks]
+        self._done = bytearray(1 if t.done else 0 for t in tasks)
+        self._invalidate_search_index()
+        self._next_id = next_id
+        self._journal_lines = lines
+
+    def _save_journal(self, path: "Path") -> None:
+        """Append this session's events; rewrite only when the log is bloated."""
+        if orjson is not None:
+            dumps = orjson.dumps
+        else:
+            def dumps(o):
+                return json.dumps(o, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        total = self._journal_lines + len(self._events)
+        threshold = max(_JOURNAL_COMPACT_RATIO * len(self._tasks), _JOURNAL_COMPACT_RATIO)
+        if path.exists() and not self._journal_rewrite and total <= threshold:
+            payload = b"\n".join(dumps(ev) for ev in self._events) + b"\n"
+            fd = os.open(str(path), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, payload)
+                if os.environ.get("TODO_FSYNC"):
+                    os.fsync(fd)
+            finally:
+                os.close(fd)
+        else:
+            # Compact: a meta line carrying next_id (so ids of deleted tasks
+            # are never reused, same as the JSON store) plus one "add" event
+            # per live task replaces the whole log. Written to a fresh tmp
+            # file and renamed over the journal, so a crash mid-write never
+            # loses the existing log.
+            snapshot: List[Dict[str, Any]] = [{"op": "meta", "next_id": self._next_id}]
+            snapshot += [
+                {"op": "add", "id": t.id, "title": t.title, "done": t.done,
+                 "created_at": t.created_at.isoformat()}
+                for t in self._tasks
+            ]
+            payload = b"\n".join(dumps(ev) for ev in snapshot) + b"\n"
+            tmp = path.with_suffix(path.suffix + ".tmp")
+            fd = os.open(str(tmp), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+            try:
+                os.write(fd, payload)
+                if os.environ.get("TODO_FSYNC"):
+                    os.fsync(fd)
+            finally:
+                os.close(fd)
+            os.replace(str(tmp), str(path))
+            total = len(snapshot)
+            self._journal_rewrite = False
+        self._journal_lines = total
+        self._events = []
 
     def load_from_file(self, path: "Path") -> None:
-        """Load tasks from JSON file if it exists; otherwise start fresh."""
+        """Load tasks from the data file if it exists; otherwise start fresh.
+
+        A .msgpack/.mpk suffix selects the binary msgpack store (when the
+        msgpack package is installed), a .ndjson/.jsonl suffix selects the
+        append-only event journal; anything else is read as JSON.
+        """
+        if msgpack is None and path.suffix in _MSGPACK_SUFFIXES:
+            # Never fall through to JSON here: misreading valid msgpack
+            # bytes would trip the corrupt-file reset and lose the store.
+            raise RuntimeError("msgpack is required to read/write .msgpack/.mpk files")
+        self._events = []
+        self._journal_lines = 0
+        self._journal_rewrite = False
         try:
             if not path.exists():
                 self._tasks = []
+                self._by_id = {}
+                self._title_cf = []
+                self._done = bytearray()
+                self._invalidate_search_index()
                 self._next_id = 1
+                self._dirty = False
+                return
+            if path.suffix in _JOURNAL_SUFFIXES:
+                self._replay_journal(path)
+                self._dirty = False
                 return
-            import json
-            data = json.loads(path.read_text(encoding="utf-8"))
+            if path.suffix in _MSGPACK_SUFFIXES:
+                data = msgpack.unpackb(path.read_bytes(), raw=False)
+            elif orjson is not None:
+                data = orjson.loads(path.read_bytes())
+            else:
+                data = json.loads(path.read_text(encoding="utf-8"))
             if not isinstance(data, dict):
                 raise ValueError("Invalid data format.")
             self._from_store(data)
         except Exception:
-            # Corrupt/invalid file: start fresh
+            # Corrupt/invalid file: start fresh. For a journal this also
+            # means the next save must rewrite rather than append onto the
+            # broken log.
             self._tasks = []
+            self._by_id = {}
+            self._title_cf = []
+            self._done = bytearray()
+            self._invalidate_search_index()
             self._next_id = 1
+            self._journal_lines = 0
+            self._journal_rewrite = True
+        self._dirty = False
 
-    def save_to_file(self, path: "Path") -> None:
-        """Atomically write current state to JSON file."""
-        import json
-        path.parent.mkdir(parents=True, exist_ok=True)
+    def save_to_file(self, path: "Path", pretty: bool = False) -> None:
+        """Atomically write current state to the data file (no-op if unchanged).
+
+        The format follows the path suffix, as in load_from_file. JSON output
+        is minified by default; pass pretty=True for an indented,
+        human-readable file.
+        """
+        if msgpack is None and path.suffix in _MSGPACK_SUFFIXES:
+            raise RuntimeError("msgpack is required to read/write .msgpack/.mpk files")
+        if not self._dirty:
+            return
+        if not self._dir_ready:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._dir_ready = True
+        if path.suffix in _JOURNAL_SUFFIXES:
+            self._save_journal(path)
+            self._dirty = False
+            return
         tmp = path.with_suffix(path.suffix + ".tmp")
         data = self._to_store()
-        tmp.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+        if path.suffix in _MSGPACK_SUFFIXES:
+            payload = msgpack.packb(data, use_bin_type=True, default=_msgpack_default)
+        elif orjson is not None:
+            payload = orjson.dumps(data, option=orjson.OPT_INDENT_2 if pretty else 0)
+        elif pretty:
+            payload = json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
+        else:
+            payload = json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        # Single open/write/close instead of Path.write_* to cut syscalls.
+        fd = os.open(str(tmp), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.write(fd, payload)
+            if os.environ.get("TODO_FSYNC"):
+                os.fsync(fd)
+        finally:
+            os.close(fd)
         # Atomic-ish replace
-        tmp.replace(path)
+        os.replace(str(tmp), str(path))
+        self._events = []
+        self._dirty = False
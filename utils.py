@@ -1,3 +1,4 @@
+import sys
 from typing import Iterable
 from todo import Task
 
@@ -6,8 +7,8 @@ def print_tasks(tasks: Iterable[Task]) -> None:
     if not items:
         print("No tasks.")
         return
-    for t in items:
-        print(repr(t))
+    # One write for the whole batch instead of a print() per task.
+    sys.stdout.write("\n".join(map(repr, items)) + "\n")
 
 def print_error(err: Exception) -> None:
     print(f"Error: {err}")